@@ -18,4 +18,4 @@ fi
 
 # Start FastAPI using uv and the locked environment
 cd whatsapp-mcp-server
-uv run uvicorn main:app --host 0.0.0.0 --port "$PORT"
+uv run uvicorn main:app --host 0.0.0.0 --port "$PORT" --loop uvloop --http httptools
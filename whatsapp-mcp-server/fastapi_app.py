@@ -1,5 +1,6 @@
-from typing import Any, Dict, List, Optional
-from dataclasses import asdict, is_dataclass
+from typing import Any, Callable, Dict, List, Optional, Union, get_args, get_origin, get_type_hints
+from dataclasses import fields, is_dataclass
+from datetime import datetime
 
 from fastapi import FastAPI, Query
 from pydantic import BaseModel
@@ -24,9 +25,77 @@ app = FastAPI(title="whatsapp-mcp-fastapi", version="0.1.0")
 
 # ---------- Helpers ----------
 
+_SCALAR_TYPES = (str, int, float, bool, datetime, type(None))
+
+# Per-type generated serializers, built on first sight of a dataclass type
+_TYPE_SERIALIZERS: Dict[type, Callable[[Any], Dict[str, Any]]] = {}
+
+
+def _dataclass_arg(hint: Any) -> Optional[type]:
+    """Return the dataclass type in `hint` if it is `D` or `Optional[D]`."""
+    if get_origin(hint) is Union:
+        args = [arg for arg in get_args(hint) if arg is not type(None)]
+        hint = args[0] if len(args) == 1 else None
+    return hint if isinstance(hint, type) and is_dataclass(hint) else None
+
+
+def _is_scalar(hint: Any) -> bool:
+    """True for immutable leaf types (optionally Optional) that need no conversion."""
+    args = get_args(hint) if get_origin(hint) is Union else (hint,)
+    return all(arg in _SCALAR_TYPES for arg in args)
+
+
+def _serializer_for(cls: type) -> Callable[[Any], Dict[str, Any]]:
+    serializer = _TYPE_SERIALIZERS.get(cls)
+    if serializer is not None:
+        return serializer
+
+    # Registered before building nested serializers so self-referential types (e.g.
+    # `parent: Optional["Node"]`) resolve to this forwarder instead of recursing forever
+    built: List[Callable[[Any], Dict[str, Any]]] = []
+    _TYPE_SERIALIZERS[cls] = lambda o: built[0](o)
+    try:
+        serializer = _build_serializer(cls)
+    except BaseException:
+        del _TYPE_SERIALIZERS[cls]
+        raise
+    built.append(serializer)
+    _TYPE_SERIALIZERS[cls] = serializer
+    return serializer
+
+
+def _build_serializer(cls: type) -> Callable[[Any], Dict[str, Any]]:
+    hints = get_type_hints(cls)
+    namespace: Dict[str, Any] = {"_convert": dataclass_to_dict}
+    items = []
+    for index, field in enumerate(fields(cls)):
+        hint = hints.get(field.name, Any)
+        nested = _dataclass_arg(hint)
+        if get_origin(hint) in (list, List):
+            (item_hint,) = get_args(hint) or (Any,)
+            nested_item = _dataclass_arg(item_hint)
+            if nested_item is not None:
+                namespace[f"_s{index}"] = _serializer_for(nested_item)
+                expr = f"[_s{index}(i) for i in o.{field.name}]"
+            else:
+                expr = f"_convert(o.{field.name})"
+        elif nested is not None:
+            namespace[f"_s{index}"] = _serializer_for(nested)
+            expr = f"(None if o.{field.name} is None else _s{index}(o.{field.name}))"
+        elif _is_scalar(hint):
+            expr = f"o.{field.name}"
+        else:
+            expr = f"_convert(o.{field.name})"
+        items.append(f"{field.name!r}: {expr}")
+
+    source = "def _to_dict(o):\n    return {" + ", ".join(items) + "}\n"
+    exec(source, namespace)
+    return namespace["_to_dict"]
+
+
 def dataclass_to_dict(obj: Any) -> Any:
-    if is_dataclass(obj):
-        return asdict(obj)
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return _serializer_for(type(obj))(obj)
     if isinstance(obj, list):
         return [dataclass_to_dict(item) for item in obj]
     if isinstance(obj, dict):
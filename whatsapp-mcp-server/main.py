@@ -1,19 +1,30 @@
-from typing import Any, Dict, List, Optional, Literal
-from dataclasses import asdict, is_dataclass
+from typing import Annotated, Any, Awaitable, Callable, Dict, List, Mapping, Optional, Literal, Set, Tuple
+import asyncio
+import hmac
 import os
-import json
-from datetime import datetime
-from collections import deque
-
-from fastapi import FastAPI, Query, Request, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+import re
+import time
+from contextlib import asynccontextmanager
+from functools import partial
+from types import MappingProxyType
+
+from fastapi import Depends, FastAPI, Query, Request, HTTPException, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
 from dotenv import load_dotenv
+import anyio
 import httpx
+import msgspec
+import orjson
+from cachetools import TTLCache
 
 from whatsapp import (
     search_contacts as whatsapp_search_contacts,
     list_messages as whatsapp_list_messages,
+    fetch_messages as whatsapp_fetch_messages,
+    format_listed_messages as whatsapp_format_listed_messages,
     list_chats as whatsapp_list_chats,
     get_chat as whatsapp_get_chat,
     get_direct_chat_by_contact as whatsapp_get_direct_chat_by_contact,
@@ -26,7 +37,40 @@ from whatsapp import (
     download_media as whatsapp_download_media,
 )
 
-app = FastAPI(title="whatsapp-mcp-fastapi", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Blocking whatsapp_* DB calls are offloaded to anyio's worker threads; raise the default cap of 40
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    # One pooled client for all outgoing webhooks so keep-alive connections are reused;
+    # HTTP/2 (negotiated for https targets) multiplexes concurrent dispatches over one connection
+    app.state.client = httpx.AsyncClient(
+        http2=True,
+        timeout=httpx.Timeout(10.0, connect=WEBHOOK_CONNECT_TIMEOUT),
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60),
+    )
+    # Fire-and-forget webhook dispatches still in flight, drained before the client closes
+    app.state.pending_webhooks = set()
+    yield
+    pending = set(app.state.pending_webhooks)
+    if pending:
+        # timeout_seconds is client-supplied, so bound the drain and cancel stragglers
+        _, still_running = await asyncio.wait(pending, timeout=WEBHOOK_SHUTDOWN_GRACE)
+        if still_running:
+            print(f"Cancelling {len(still_running)} webhook(s) still in flight at shutdown")
+        for task in still_running:
+            task.cancel()
+        await asyncio.gather(*still_running, return_exceptions=True)
+    await app.state.client.aclose()
+
+
+app = FastAPI(
+    title="whatsapp-mcp-fastapi",
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 # Load environment variables from local .env
 load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env"))
@@ -37,71 +81,232 @@ OUTGOING_WEBHOOK_HEADERS = os.environ.get("OUTGOING_WEBHOOK_HEADERS")  # JSON st
 OUTGOING_WEBHOOK_SECRET_HEADER = os.environ.get("OUTGOING_WEBHOOK_SECRET_HEADER", "X-Webhook-Api-Key")
 # Reuse WEBHOOK_API_KEY by default if a separate outgoing secret is not provided
 OUTGOING_WEBHOOK_SECRET = os.environ.get("OUTGOING_WEBHOOK_SECRET") or WEBHOOK_API_KEY
+# Connect timeout for outgoing webhooks; the per-call timeout_seconds covers the rest
+WEBHOOK_CONNECT_TIMEOUT = 2.0
+# Max seconds shutdown waits for in-flight async webhooks before cancelling them
+WEBHOOK_SHUTDOWN_GRACE = float(os.environ.get("WEBHOOK_SHUTDOWN_GRACE", "10"))
+# Max worker threads for blocking whatsapp_* calls
+THREADPOOL_SIZE = int(os.environ.get("THREADPOOL_SIZE", "200"))
 
 try:
-    DEFAULT_OUTGOING_HEADERS = json.loads(OUTGOING_WEBHOOK_HEADERS) if OUTGOING_WEBHOOK_HEADERS else {}
-    if not isinstance(DEFAULT_OUTGOING_HEADERS, dict):
-        DEFAULT_OUTGOING_HEADERS = {}
-except Exception:
-    DEFAULT_OUTGOING_HEADERS = {}
+    _raw_outgoing_headers = orjson.loads(OUTGOING_WEBHOOK_HEADERS) if OUTGOING_WEBHOOK_HEADERS else {}
+except orjson.JSONDecodeError as e:
+    print(f"Ignoring invalid OUTGOING_WEBHOOK_HEADERS: {e}")
+    _raw_outgoing_headers = {}
+if not isinstance(_raw_outgoing_headers, dict):
+    print("Ignoring OUTGOING_WEBHOOK_HEADERS: expected a JSON object")
+    _raw_outgoing_headers = {}
+# Read-only: parsed once at import and shared by every outgoing webhook call
+DEFAULT_OUTGOING_HEADERS: Mapping[str, str] = MappingProxyType(_raw_outgoing_headers)
+
+
+class EventRing:
+    """Fixed-size ring buffer of ingested events with preallocated, reused slots.
+
+    Not thread-safe: only touched from async endpoints on the event loop.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.slots: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self.index = 0  # next slot to write
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, timestamp: str, headers: List[Tuple[bytes, bytes]], body_bytes: bytes) -> None:
+        slot = self.slots[self.index]
+        if slot is None:
+            self.slots[self.index] = {"timestamp": timestamp, "headers": headers, "body_bytes": body_bytes}
+        else:
+            slot["timestamp"] = timestamp
+            slot["headers"] = headers
+            slot["body_bytes"] = body_bytes
+        self.index = (self.index + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def latest(self, limit: int) -> List[Dict[str, Any]]:
+        """The newest `limit` events, oldest first; O(limit) with wraparound."""
+        n = max(0, min(limit, self.count))
+        start = (self.index - n) % self.capacity
+        if start + n <= self.capacity:
+            return self.slots[start:start + n]
+        return self.slots[start:] + self.slots[:self.index]
+
 
 # In-memory received events buffer (for quick inspection)
-RECEIVED_EVENTS: deque = deque(maxlen=200)
+RECEIVED_EVENTS = EventRing(200)
 
 
 # ---------- Security Middleware ----------
 
-EXEMPT_PATHS = {"/docs", "/redoc", "/openapi.json", "/health"}
+EXEMPT_PATHS = frozenset({"/docs", "/redoc", "/openapi.json", "/health"})
+# Encoded once at import; compared against raw header bytes from the ASGI scope
+WEBHOOK_API_KEY_B = WEBHOOK_API_KEY.encode() if WEBHOOK_API_KEY else None
+
+
+class WebhookAuthMiddleware:
+    """Pure ASGI middleware enforcing the `X-Webhook-Api-Key` header.
+
+    Avoids `BaseHTTPMiddleware` (per-request task group and body streaming);
+    headers are scanned straight from the ASGI scope.
+    """
+
+    _JSON_HEADERS = [(b"content-type", b"application/json")]
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Skip protection for docs and health
+        if scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        if WEBHOOK_API_KEY_B is None:
+            # If not configured, block by default to avoid accidental exposure
+            await self._reject(send, 500, b'{"detail":"Server misconfiguration: WEBHOOK_API_KEY not set"}')
+            return
 
-@app.middleware("http")
-async def require_webhook_api_key(request: Request, call_next):
-    # Skip protection for docs and health
-    if request.url.path in EXEMPT_PATHS:
-        return await call_next(request)
+        header_value = None
+        for name, value in scope["headers"]:
+            if name == b"x-webhook-api-key":
+                header_value = value
+                break
+        if header_value is None:
+            await self._reject(send, 401, b'{"detail":"Missing X-Webhook-Api-Key header"}')
+            return
+        if not hmac.compare_digest(header_value, WEBHOOK_API_KEY_B):
+            await self._reject(send, 403, b'{"detail":"Invalid webhook API key"}')
+            return
 
-    if not WEBHOOK_API_KEY:
-        # If not configured, block by default to avoid accidental exposure
-        return JSONResponse(status_code=500, content={"detail": "Server misconfiguration: WEBHOOK_API_KEY not set"})
+        await self.app(scope, receive, send)
 
-    header_value = request.headers.get("x-webhook-api-key")
-    if header_value is None:
-        return JSONResponse(status_code=401, content={"detail": "Missing X-Webhook-Api-Key header"})
-    if header_value != WEBHOOK_API_KEY:
-        return JSONResponse(status_code=403, content={"detail": "Invalid webhook API key"})
+    async def _reject(self, send, status: int, body: bytes) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": self._JSON_HEADERS + [(b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
 
-    return await call_next(request)
+
+app.add_middleware(WebhookAuthMiddleware)
+# Pure ASGI as well; list responses (/messages, /chats, /webhook/events) are repetitive JSON and
+# shrink several-fold, while small bodies (health, auth errors, send results) stay uncompressed
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 
 # ---------- Helpers ----------
 
-def dataclass_to_dict(obj: Any) -> Any:
-    if is_dataclass(obj):
-        return asdict(obj)
-    if isinstance(obj, list):
-        return [dataclass_to_dict(item) for item in obj]
-    if isinstance(obj, dict):
-        return {key: dataclass_to_dict(value) for key, value in obj.items()}
-    return obj
+def _orjson_default(obj: Any) -> Any:
+    # Fallback for types orjson does not serialize natively
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.decode("utf-8", errors="replace")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+# [epoch second, formatted ISO-8601 UTC string] for the last second seen
+_TIMESTAMP_CACHE: List[Any] = [0, ""]
+
+
+def _utc_timestamp() -> str:
+    """Second-resolution ISO-8601 UTC timestamp, formatted at most once per second."""
+    now = int(time.time())
+    if _TIMESTAMP_CACHE[0] != now:
+        _TIMESTAMP_CACHE[0] = now
+        _TIMESTAMP_CACHE[1] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))
+    return _TIMESTAMP_CACHE[1]
+
+
+def json_bytes(content: Any) -> bytes:
+    """Serialize dataclasses (and lists/dicts of them) in a single orjson pass."""
+    return orjson.dumps(content, default=_orjson_default)
+
+
+def json_response(content: Any) -> Response:
+    return Response(content=json_bytes(content), media_type="application/json")
+
+
+def msgspec_response(content: Any) -> Response:
+    """Encode msgspec Structs (and plain dicts) with msgspec's C encoder."""
+    return Response(content=msgspec.json.encode(content), media_type="application/json")
+
+
+class MessageFetchCoalescer:
+    """Share one `/messages` query among concurrent requests for the same chat and filters.
+
+    The first request for a key runs the query straight away; identical requests
+    arriving while it is in flight await the same rows instead of querying again.
+    Formatting (and its context lookups) still runs per request.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Tuple[Tuple[str, Any], ...], asyncio.Task] = {}
+
+    async def fetch(self, **params: Any) -> Optional[List[Any]]:
+        key = tuple(params.items())
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.create_task(self._fetch(key, params))
+        # Shielded so one client disconnecting doesn't cancel the query for the others
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key: Tuple[Tuple[str, Any], ...], params: Dict[str, Any]) -> Optional[List[Any]]:
+        try:
+            return await anyio.to_thread.run_sync(partial(whatsapp_fetch_messages, **params))
+        finally:
+            self._inflight.pop(key, None)
+
+
+MESSAGE_FETCHES = MessageFetchCoalescer()
+
+# Short-lived caches of serialized JSON for idempotent chat reads; hits skip both DB and encoder.
+# Only touched from async endpoints on the event loop.
+_CHAT_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=2.0)  # (chat_jid, include_last_message) -> bytes
+_CONTACT_CHATS_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=2.0)  # (jid, limit, page) -> bytes
+# Bumped on every invalidation, so a read that was already in flight does not write its
+# stale result back into the cache afterwards. One counter keeps this O(1) in memory; an
+# unrelated send only costs a concurrent miss its cache write.
+_chat_cache_generation = 0
+
+
+def _invalidate_chat_caches(recipient: str) -> None:
+    # Recipients may be bare phone numbers; those resolve to direct-chat JIDs
+    global _chat_cache_generation
+    chat_jid = recipient if "@" in recipient else f"{recipient}@s.whatsapp.net"
+    _chat_cache_generation += 1
+    for cache in (_CHAT_CACHE, _CONTACT_CHATS_CACHE):
+        for key in [key for key in cache.keys() if key[0] == chat_jid]:
+            cache.pop(key, None)
 
 
 # ---------- Request Models ----------
 
-class SendTextRequest(BaseModel):
+# msgspec Structs: bodies are decoded and validated in C via `msgspec_body`
+
+class SendTextRequest(msgspec.Struct):
     recipient: str
     message: str
 
 
-class SendMediaRequest(BaseModel):
+class SendMediaRequest(msgspec.Struct):
     recipient: str
     media_path: str
 
 
-class DownloadMediaRequest(BaseModel):
+class DownloadMediaRequest(msgspec.Struct):
     message_id: str
     chat_jid: str
 
 
-class WebhookTriggerRequest(BaseModel):
+class WebhookTriggerRequest(msgspec.Struct):
     target_url: Optional[str] = None
     method: Literal["POST", "GET"] = "POST"
     payload: Optional[Dict[str, Any]] = None
@@ -110,158 +315,276 @@ class WebhookTriggerRequest(BaseModel):
     async_mode: bool = True
     timeout_seconds: float = 10.0
 
-class IngestResponse(BaseModel):
+class IngestResponse(msgspec.Struct):
     received: bool
     stored_events: int
 
 
+def msgspec_schema(struct_type: type) -> Dict[str, Any]:
+    """Inline JSON schema of a flat msgspec Struct, for OpenAPI docs."""
+    _, components = msgspec.json.schema_components([struct_type])
+    return components[struct_type.__name__]
+
+
+# msgspec appends the failing location to ValidationError messages, e.g. "... - at `$.headers[0]`"
+_MSGSPEC_PATH = re.compile(r" - at `\$(.*)`$")
+_MSGSPEC_PATH_PART = re.compile(r"\[\.\.\.\]|\.([^.\[]+)|\[(\d+)\]")
+_MSGSPEC_MISSING_FIELD = re.compile(r"^Object missing required field `([^`]+)`")
+
+
+def _msgspec_error(e: msgspec.DecodeError) -> Dict[str, Any]:
+    """Translate a msgspec decode error into a pydantic-style 422 error entry."""
+    msg = str(e)
+    if not isinstance(e, msgspec.ValidationError):
+        return {"type": "json_invalid", "loc": ("body",), "msg": msg, "input": None}
+    loc: List[Any] = ["body"]
+    path = _MSGSPEC_PATH.search(msg)
+    if path:
+        msg = msg[:path.start()]
+        # Dict values show up as "[...]" and carry no key, so their loc stops at the field
+        loc.extend(name or int(index) for name, index in _MSGSPEC_PATH_PART.findall(path.group(1)) if name or index)
+    missing = _MSGSPEC_MISSING_FIELD.match(msg)
+    if missing:
+        loc.append(missing.group(1))
+        return {"type": "missing", "loc": tuple(loc), "msg": "Field required", "input": None}
+    return {"type": "value_error", "loc": tuple(loc), "msg": msg, "input": None}
+
+
+def msgspec_body(struct_type: type) -> Callable[[Request], Awaitable[Any]]:
+    """Dependency decoding the JSON request body straight into `struct_type`."""
+    async def decode(request: Request) -> Any:
+        try:
+            # strict=False keeps pydantic-style lax coercion (e.g. "10" -> 10.0)
+            return msgspec.json.decode(await request.body(), type=struct_type, strict=False)
+        except msgspec.DecodeError as e:
+            raise RequestValidationError([_msgspec_error(e)])
+    return decode
+
+
+def msgspec_request_body(struct_type: type) -> Dict[str, Any]:
+    """`openapi_extra` documenting a msgspec Struct request body."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": msgspec_schema(struct_type)}},
+        }
+    }
+
+
+# ---------- Query Parameter Models ----------
+# Validated as a whole by pydantic-core in one call per request
+
+class PageParams(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    limit: int = 20
+    page: int = 0
+
+
+class ListMessagesParams(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    after: Optional[str] = None
+    before: Optional[str] = None
+    sender_phone_number: Optional[str] = None
+    chat_jid: Optional[str] = None
+    query: Optional[str] = None
+    limit: int = 20
+    page: int = 0
+    include_context: bool = True
+    context_before: int = 1
+    context_after: int = 1
+
+
+# ListMessagesParams fields that only affect formatting, not the query
+LIST_MESSAGES_FORMAT_PARAMS = frozenset({"include_context", "context_before", "context_after"})
+
+
+class ListChatsParams(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    query: Optional[str] = None
+    limit: int = 20
+    page: int = 0
+    include_last_message: bool = True
+    sort_by: str = "last_active"
+
+
 # ---------- Endpoints (replicating tools) ----------
 
+_HEALTH_RESPONSE_BODY = b'{"status":"ok"}'
+
+
 @app.get("/health")
-def health() -> Dict[str, str]:
-    return {"status": "ok"}
+async def health() -> Dict[str, str]:
+    # Constant body: skip response validation and JSON encoding entirely
+    return Response(content=_HEALTH_RESPONSE_BODY, media_type="application/json")
 
 @app.get("/contacts/search")
-def search_contacts(query: str = Query(..., description="Search name or phone number")) -> List[Dict[str, Any]]:
-    contacts = whatsapp_search_contacts(query)
-    return dataclass_to_dict(contacts)
+async def search_contacts(query: str = Query(..., description="Search name or phone number")) -> List[Dict[str, Any]]:
+    contacts = await anyio.to_thread.run_sync(whatsapp_search_contacts, query)
+    return json_response(contacts)
 
 
 @app.get("/messages")
-def list_messages(
-    after: Optional[str] = None,
-    before: Optional[str] = None,
-    sender_phone_number: Optional[str] = None,
-    chat_jid: Optional[str] = None,
-    query: Optional[str] = None,
-    limit: int = 20,
-    page: int = 0,
-    include_context: bool = True,
-    context_before: int = 1,
-    context_after: int = 1,
-) -> Dict[str, Any]:
+async def list_messages(params: Annotated[ListMessagesParams, Query()]) -> Dict[str, Any]:
     # whatsapp_list_messages returns a formatted string when include_context is True
-    messages_output = whatsapp_list_messages(
-        after=after,
-        before=before,
-        sender_phone_number=sender_phone_number,
-        chat_jid=chat_jid,
-        query=query,
-        limit=limit,
-        page=page,
-        include_context=include_context,
-        context_before=context_before,
-        context_after=context_after,
-    )
+    if params.chat_jid:
+        # Concurrent polls of the same chat share one query; context lookups stay per request
+        result = await MESSAGE_FETCHES.fetch(**params.model_dump(exclude=LIST_MESSAGES_FORMAT_PARAMS))
+        if result is None:
+            # Database error; list_messages returns an empty list in that case
+            messages_output: Any = []
+        else:
+            messages_output = await anyio.to_thread.run_sync(
+                whatsapp_format_listed_messages,
+                result, params.include_context, params.context_before, params.context_after,
+            )
+    else:
+        messages_output = await anyio.to_thread.run_sync(partial(whatsapp_list_messages, **params.model_dump()))
     if isinstance(messages_output, str):
         return {"output": messages_output}
     # Fallback for potential list of dataclasses
-    return {"messages": dataclass_to_dict(messages_output)}
+    return json_response({"messages": messages_output})
 
 
 @app.get("/chats")
-def list_chats(
-    query: Optional[str] = None,
-    limit: int = 20,
-    page: int = 0,
-    include_last_message: bool = True,
-    sort_by: str = "last_active",
-) -> List[Dict[str, Any]]:
-    chats = whatsapp_list_chats(
-        query=query,
-        limit=limit,
-        page=page,
-        include_last_message=include_last_message,
-        sort_by=sort_by,
-    )
-    return dataclass_to_dict(chats)
+async def list_chats(params: Annotated[ListChatsParams, Query()]) -> List[Dict[str, Any]]:
+    chats = await anyio.to_thread.run_sync(partial(whatsapp_list_chats, **params.model_dump()))
+    return json_response(chats)
 
 
 @app.get("/chats/{chat_jid}")
-def get_chat(chat_jid: str, include_last_message: bool = True) -> Optional[Dict[str, Any]]:
-    chat = whatsapp_get_chat(chat_jid, include_last_message)
-    return dataclass_to_dict(chat)
+async def get_chat(chat_jid: str, include_last_message: bool = True) -> Optional[Dict[str, Any]]:
+    key = (chat_jid, include_last_message)
+    body = _CHAT_CACHE.get(key)
+    if body is None:
+        generation = _chat_cache_generation
+        chat = await anyio.to_thread.run_sync(whatsapp_get_chat, chat_jid, include_last_message)
+        body = json_bytes(chat)
+        if _chat_cache_generation == generation:
+            _CHAT_CACHE[key] = body
+    return Response(content=body, media_type="application/json")
 
 
 @app.get("/chats/direct-by-contact")
-def get_direct_chat_by_contact(sender_phone_number: str) -> Optional[Dict[str, Any]]:
-    chat = whatsapp_get_direct_chat_by_contact(sender_phone_number)
-    return dataclass_to_dict(chat)
+async def get_direct_chat_by_contact(sender_phone_number: str) -> Optional[Dict[str, Any]]:
+    chat = await anyio.to_thread.run_sync(whatsapp_get_direct_chat_by_contact, sender_phone_number)
+    return json_response(chat)
 
 
 @app.get("/contacts/{jid}/chats")
-def get_contact_chats(jid: str, limit: int = 20, page: int = 0) -> List[Dict[str, Any]]:
-    chats = whatsapp_get_contact_chats(jid, limit, page)
-    return dataclass_to_dict(chats)
+async def get_contact_chats(jid: str, params: Annotated[PageParams, Query()]) -> List[Dict[str, Any]]:
+    key = (jid, params.limit, params.page)
+    body = _CONTACT_CHATS_CACHE.get(key)
+    if body is None:
+        generation = _chat_cache_generation
+        chats = await anyio.to_thread.run_sync(whatsapp_get_contact_chats, jid, params.limit, params.page)
+        body = json_bytes(chats)
+        if _chat_cache_generation == generation:
+            _CONTACT_CHATS_CACHE[key] = body
+    return Response(content=body, media_type="application/json")
 
 
 @app.get("/contacts/{jid}/last-interaction")
-def get_last_interaction(jid: str) -> Dict[str, Optional[str]]:
-    message = whatsapp_get_last_interaction(jid)
+async def get_last_interaction(jid: str) -> Dict[str, Optional[str]]:
+    message = await anyio.to_thread.run_sync(whatsapp_get_last_interaction, jid)
     return {"output": message}
 
 
 @app.get("/messages/{message_id}/context")
-def get_message_context(message_id: str, before: int = 5, after: int = 5) -> Dict[str, Any]:
-    context = whatsapp_get_message_context(message_id, before, after)
-    return dataclass_to_dict(context)
+async def get_message_context(message_id: str, before: int = 5, after: int = 5) -> Dict[str, Any]:
+    context = await anyio.to_thread.run_sync(whatsapp_get_message_context, message_id, before, after)
+    return json_response(context)
 
 
-@app.post("/messages/send-text")
-def send_message(payload: SendTextRequest) -> Dict[str, Any]:
-    success, status_message = whatsapp_send_message(payload.recipient, payload.message)
-    return {"success": success, "message": status_message}
+@app.post("/messages/send-text", openapi_extra=msgspec_request_body(SendTextRequest))
+async def send_message(
+    payload: Annotated[SendTextRequest, Depends(msgspec_body(SendTextRequest))],
+) -> Dict[str, Any]:
+    success, status_message = await anyio.to_thread.run_sync(whatsapp_send_message, payload.recipient, payload.message)
+    if success:
+        _invalidate_chat_caches(payload.recipient)
+    return msgspec_response({"success": success, "message": status_message})
 
 
-@app.post("/messages/send-file")
-def send_file(payload: SendMediaRequest) -> Dict[str, Any]:
-    success, status_message = whatsapp_send_file(payload.recipient, payload.media_path)
-    return {"success": success, "message": status_message}
+@app.post("/messages/send-file", openapi_extra=msgspec_request_body(SendMediaRequest))
+async def send_file(
+    payload: Annotated[SendMediaRequest, Depends(msgspec_body(SendMediaRequest))],
+) -> Dict[str, Any]:
+    success, status_message = await anyio.to_thread.run_sync(whatsapp_send_file, payload.recipient, payload.media_path)
+    if success:
+        _invalidate_chat_caches(payload.recipient)
+    return msgspec_response({"success": success, "message": status_message})
 
 
-@app.post("/messages/send-audio")
-def send_audio_message(payload: SendMediaRequest) -> Dict[str, Any]:
-    success, status_message = whatsapp_send_audio_message(payload.recipient, payload.media_path)
-    return {"success": success, "message": status_message}
+@app.post("/messages/send-audio", openapi_extra=msgspec_request_body(SendMediaRequest))
+async def send_audio_message(
+    payload: Annotated[SendMediaRequest, Depends(msgspec_body(SendMediaRequest))],
+) -> Dict[str, Any]:
+    success, status_message = await anyio.to_thread.run_sync(
+        whatsapp_send_audio_message, payload.recipient, payload.media_path
+    )
+    if success:
+        _invalidate_chat_caches(payload.recipient)
+    return msgspec_response({"success": success, "message": status_message})
 
 
-@app.post("/media/download")
-def download_media(payload: DownloadMediaRequest) -> Dict[str, Any]:
+@app.post("/media/download", openapi_extra=msgspec_request_body(DownloadMediaRequest))
+def download_media(
+    payload: Annotated[DownloadMediaRequest, Depends(msgspec_body(DownloadMediaRequest))],
+) -> Dict[str, Any]:
     file_path = whatsapp_download_media(payload.message_id, payload.chat_jid)
     if file_path:
-        return {"success": True, "message": "Media downloaded successfully", "file_path": file_path}
-    return {"success": False, "message": "Failed to download media"}
-
-
-def _build_outgoing_headers(override_headers: Optional[Dict[str, str]]) -> Dict[str, str]:
-    headers: Dict[str, str] = dict(DEFAULT_OUTGOING_HEADERS)
-    if OUTGOING_WEBHOOK_SECRET:
-        headers[OUTGOING_WEBHOOK_SECRET_HEADER] = OUTGOING_WEBHOOK_SECRET
-    if override_headers:
-        headers.update({k: v for k, v in override_headers.items() if isinstance(k, str) and isinstance(v, str)})
-    # Ensure JSON content-type by default for POST
-    if "Content-Type" not in headers:
-        headers["Content-Type"] = "application/json"
-    return headers
+        return msgspec_response({"success": True, "message": "Media downloaded successfully", "file_path": file_path})
+    return msgspec_response({"success": False, "message": "Failed to download media"})
+
+
+# Outgoing headers when a call supplies no overrides: defaults + secret + JSON content-type.
+# Shared across calls, so it is frozen; httpx accepts any Mapping.
+_base_outgoing_headers: Dict[str, str] = dict(DEFAULT_OUTGOING_HEADERS)
+if OUTGOING_WEBHOOK_SECRET:
+    _base_outgoing_headers[OUTGOING_WEBHOOK_SECRET_HEADER] = OUTGOING_WEBHOOK_SECRET
+# Ensure JSON content-type by default for POST
+_base_outgoing_headers.setdefault("Content-Type", "application/json")
+_BASE_OUTGOING_HEADERS: Mapping[str, str] = MappingProxyType(_base_outgoing_headers)
+
+
+def _build_outgoing_headers(override_headers: Optional[Dict[str, str]]) -> Mapping[str, str]:
+    if not override_headers:
+        return _BASE_OUTGOING_HEADERS
+    return {
+        **_BASE_OUTGOING_HEADERS,
+        **{k: v for k, v in override_headers.items() if isinstance(k, str) and isinstance(v, str)},
+    }
 
 
-def _send_webhook_sync(
+async def _send_webhook_async(
+    client: httpx.AsyncClient,
     url: str,
     method: str,
-    headers: Dict[str, str],
+    headers: Mapping[str, str],
     payload: Optional[Dict[str, Any]],
     query: Optional[Dict[str, str]],
     timeout_seconds: float,
-) -> None:
-    with httpx.Client(timeout=timeout_seconds, follow_redirects=True) as client:
-        if method == "GET":
-            client.get(url, params=query, headers=headers)
-        else:
-            client.post(url, params=query, headers=headers, json=(payload or {}))
+) -> httpx.Response:
+    timeout = httpx.Timeout(timeout_seconds, connect=min(WEBHOOK_CONNECT_TIMEOUT, timeout_seconds))
+    if method == "GET":
+        return await client.get(url, params=query, headers=headers, timeout=timeout)
+    return await client.post(url, params=query, headers=headers, json=(payload or {}), timeout=timeout)
+
+
+def _on_webhook_done(pending: Set[asyncio.Task], task: asyncio.Task) -> None:
+    pending.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"Background webhook error: {task.exception()!r}")
 
 
-@app.post("/webhook/trigger")
-async def webhook_trigger(payload: WebhookTriggerRequest, background_tasks: BackgroundTasks) -> Dict[str, Any]:
+@app.post("/webhook/trigger", openapi_extra=msgspec_request_body(WebhookTriggerRequest))
+async def webhook_trigger(
+    payload: Annotated[WebhookTriggerRequest, Depends(msgspec_body(WebhookTriggerRequest))],
+    request: Request,
+) -> Dict[str, Any]:
     """Trigger a configurable outgoing webhook call.
 
     - If `target_url` is omitted, uses `OUTGOING_WEBHOOK_URL` from env.
@@ -274,26 +597,29 @@ async def webhook_trigger(payload: WebhookTriggerRequest, background_tasks: Back
 
     headers = _build_outgoing_headers(payload.headers)
     method = payload.method.upper()
+    client = request.app.state.client
 
     if payload.async_mode:
-        background_tasks.add_task(
-            _send_webhook_sync,
+        task = asyncio.create_task(_send_webhook_async(
+            client,
             url,
             method,
             headers,
             payload.payload,
             payload.query,
             payload.timeout_seconds,
-        )
+        ))
+        # Strong reference keeps the task alive until done; asyncio itself only holds a weak one
+        pending = request.app.state.pending_webhooks
+        pending.add(task)
+        task.add_done_callback(partial(_on_webhook_done, pending))
         return {"scheduled": True}
 
     # Synchronous dispatch: await result and return status
     try:
-        async with httpx.AsyncClient(timeout=payload.timeout_seconds, follow_redirects=True) as client:
-            if method == "GET":
-                resp = await client.get(url, params=payload.query, headers=headers)
-            else:
-                resp = await client.post(url, params=payload.query, headers=headers, json=(payload.payload or {}))
+        resp = await _send_webhook_async(
+            client, url, method, headers, payload.payload, payload.query, payload.timeout_seconds
+        )
         text_excerpt = (resp.text or "")[:1000]
         return {
             "scheduled": False,
@@ -305,29 +631,65 @@ async def webhook_trigger(payload: WebhookTriggerRequest, background_tasks: Back
         raise HTTPException(status_code=502, detail=f"Webhook request error: {str(e)}")
 
 
-@app.post("/webhook/ingest", response_model=IngestResponse)
-async def webhook_ingest(request: Request) -> IngestResponse:
+@app.post(
+    "/webhook/ingest",
+    response_model=None,
+    responses={200: {"content": {"application/json": {"schema": msgspec_schema(IngestResponse)}}}},
+)
+async def webhook_ingest(request: Request) -> Response:
     """Receive webhook events (e.g., from the Go bridge) and store briefly in memory.
 
     Requires the same `X-Webhook-Api-Key` header as other protected endpoints.
     """
+    body = await request.body()
     try:
-        payload = await request.json()
-    except Exception:
-        payload = {"_raw": await request.body()}
-    RECEIVED_EVENTS.append({
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "headers": dict(request.headers),
-        "body": payload,
-    })
-    return IngestResponse(received=True, stored_events=len(RECEIVED_EVENTS))
+        # Validate with the C parser; valid bodies are kept as-is and spliced into /webhook/events
+        orjson.loads(body)
+        body_bytes = body
+    except orjson.JSONDecodeError:
+        body_bytes = orjson.dumps({"_raw": body}, default=_orjson_default)
+    # Raw ASGI header list, kept by reference; decoded only when events are listed
+    RECEIVED_EVENTS.append(_utc_timestamp(), request.scope["headers"], body_bytes)
+    return msgspec_response(IngestResponse(received=True, stored_events=len(RECEIVED_EVENTS)))
+
+
+def _decode_raw_headers(raw_headers: List[Tuple[bytes, bytes]]) -> Dict[str, str]:
+    # Same result as dict(request.headers): latin-1 names and values, first value wins
+    headers: Dict[str, str] = {}
+    for name, value in raw_headers:
+        headers.setdefault(name.decode("latin-1"), value.decode("latin-1"))
+    return headers
 
 
 @app.get("/webhook/events")
-def list_ingested_events(limit: int = 20) -> Dict[str, Any]:
-    events = list(RECEIVED_EVENTS)[-max(0, min(limit, len(RECEIVED_EVENTS))):]
-    return {"events": events}
+async def list_ingested_events(limit: int = 20) -> Dict[str, Any]:
+    # limit <= 0 returns every stored event, as before
+    events = RECEIVED_EVENTS.latest(limit if limit > 0 else len(RECEIVED_EVENTS))
+    return json_response({
+        "events": [
+            {
+                "timestamp": event["timestamp"],
+                "headers": _decode_raw_headers(event["headers"]),
+                "body": orjson.Fragment(event["body_bytes"]),
+            }
+            for event in events
+        ]
+    })
 
 
-# Local dev entrypoint (optional)
-# Run with: uvicorn fastapi_app:app --reload --port 8000
+# Entrypoint: uvloop event loop + httptools HTTP parser (both from uvicorn[standard])
+# Run with: python main.py
+# Or:       uvicorn main:app --loop uvloop --http httptools --port 8000
+# Local dev: uvicorn main:app --reload --port 8000
+# WEB_CONCURRENCY > 1 runs several workers, each with its own in-memory /webhook/events buffer.
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(
+        "main:app",
+        host=os.environ.get("HOST", "0.0.0.0"),
+        port=int(os.environ.get("PORT", "8000")),
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.environ.get("WEB_CONCURRENCY", "1")),
+    )
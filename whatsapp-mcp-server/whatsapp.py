@@ -1,7 +1,7 @@
 import sqlite3
 from datetime import datetime
 from dataclasses import dataclass
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict
 import os.path
 import requests
 import json
@@ -121,19 +121,89 @@ def format_messages_list(messages: List[Message], show_chat_info: bool = True) -
         output += format_message(message, show_chat_info)
     return output
 
-def list_messages(
+def _message_filters(
+    after: Optional[str],
+    before: Optional[str],
+    sender_phone_number: Optional[str],
+    query: Optional[str]
+) -> Tuple[List[str], list]:
+    """Build the shared WHERE clauses and params for message listing."""
+    where_clauses = []
+    params = []
+
+    if after:
+        try:
+            after = datetime.fromisoformat(after)
+        except ValueError:
+            raise ValueError(f"Invalid date format for 'after': {after}. Please use ISO-8601 format.")
+        
+        where_clauses.append("messages.timestamp > ?")
+        params.append(after)
+
+    if before:
+        try:
+            before = datetime.fromisoformat(before)
+        except ValueError:
+            raise ValueError(f"Invalid date format for 'before': {before}. Please use ISO-8601 format.")
+        
+        where_clauses.append("messages.timestamp < ?")
+        params.append(before)
+
+    if sender_phone_number:
+        where_clauses.append("messages.sender = ?")
+        params.append(sender_phone_number)
+        
+    if query:
+        where_clauses.append("LOWER(messages.content) LIKE LOWER(?)")
+        params.append(f"%{query}%")
+
+    return where_clauses, params
+
+
+def _message_from_row(msg: tuple) -> Message:
+    return Message(
+        timestamp=datetime.fromisoformat(msg[0]),
+        sender=msg[1],
+        chat_name=msg[2],
+        content=msg[3],
+        is_from_me=msg[4],
+        chat_jid=msg[5],
+        id=msg[6],
+        media_type=msg[7]
+    )
+
+
+def format_listed_messages(
+    result: List[Message],
+    include_context: bool,
+    context_before: int,
+    context_after: int
+) -> str:
+    if include_context and result:
+        # Add context for each message
+        messages_with_context = []
+        for msg in result:
+            context = get_message_context(msg.id, context_before, context_after)
+            messages_with_context.extend(context.before)
+            messages_with_context.append(context.message)
+            messages_with_context.extend(context.after)
+        
+        return format_messages_list(messages_with_context, show_chat_info=True)
+        
+    # Format and display messages without context
+    return format_messages_list(result, show_chat_info=True)
+
+
+def fetch_messages(
     after: Optional[str] = None,
     before: Optional[str] = None,
     sender_phone_number: Optional[str] = None,
     chat_jid: Optional[str] = None,
     query: Optional[str] = None,
     limit: int = 20,
-    page: int = 0,
-    include_context: bool = True,
-    context_before: int = 1,
-    context_after: int = 1
-) -> List[Message]:
-    """Get messages matching the specified criteria with optional context."""
+    page: int = 0
+) -> Optional[List[Message]]:
+    """Get the unformatted messages list_messages would show, or None on a database error."""
     try:
         conn = sqlite3.connect(MESSAGES_DB_PATH)
         cursor = conn.cursor()
@@ -141,40 +211,12 @@ def list_messages(
         # Build base query
         query_parts = ["SELECT messages.timestamp, messages.sender, chats.name, messages.content, messages.is_from_me, chats.jid, messages.id, messages.media_type FROM messages"]
         query_parts.append("JOIN chats ON messages.chat_jid = chats.jid")
-        where_clauses = []
-        params = []
-        
-        # Add filters
-        if after:
-            try:
-                after = datetime.fromisoformat(after)
-            except ValueError:
-                raise ValueError(f"Invalid date format for 'after': {after}. Please use ISO-8601 format.")
-            
-            where_clauses.append("messages.timestamp > ?")
-            params.append(after)
-
-        if before:
-            try:
-                before = datetime.fromisoformat(before)
-            except ValueError:
-                raise ValueError(f"Invalid date format for 'before': {before}. Please use ISO-8601 format.")
-            
-            where_clauses.append("messages.timestamp < ?")
-            params.append(before)
-
-        if sender_phone_number:
-            where_clauses.append("messages.sender = ?")
-            params.append(sender_phone_number)
+        where_clauses, params = _message_filters(after, before, sender_phone_number, query)
             
         if chat_jid:
             where_clauses.append("messages.chat_jid = ?")
             params.append(chat_jid)
             
-        if query:
-            where_clauses.append("LOWER(messages.content) LIKE LOWER(?)")
-            params.append(f"%{query}%")
-            
         if where_clauses:
             query_parts.append("WHERE " + " AND ".join(where_clauses))
             
@@ -187,42 +229,35 @@ def list_messages(
         cursor.execute(" ".join(query_parts), tuple(params))
         messages = cursor.fetchall()
         
-        result = []
-        for msg in messages:
-            message = Message(
-                timestamp=datetime.fromisoformat(msg[0]),
-                sender=msg[1],
-                chat_name=msg[2],
-                content=msg[3],
-                is_from_me=msg[4],
-                chat_jid=msg[5],
-                id=msg[6],
-                media_type=msg[7]
-            )
-            result.append(message)
-            
-        if include_context and result:
-            # Add context for each message
-            messages_with_context = []
-            for msg in result:
-                context = get_message_context(msg.id, context_before, context_after)
-                messages_with_context.extend(context.before)
-                messages_with_context.append(context.message)
-                messages_with_context.extend(context.after)
-            
-            return format_messages_list(messages_with_context, show_chat_info=True)
-            
-        # Format and display messages without context
-        return format_messages_list(result, show_chat_info=True)    
+        return [_message_from_row(msg) for msg in messages]
         
     except sqlite3.Error as e:
         print(f"Database error: {e}")
-        return []
+        return None
     finally:
         if 'conn' in locals():
             conn.close()
 
 
+def list_messages(
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    sender_phone_number: Optional[str] = None,
+    chat_jid: Optional[str] = None,
+    query: Optional[str] = None,
+    limit: int = 20,
+    page: int = 0,
+    include_context: bool = True,
+    context_before: int = 1,
+    context_after: int = 1
+) -> List[Message]:
+    """Get messages matching the specified criteria with optional context."""
+    result = fetch_messages(after, before, sender_phone_number, chat_jid, query, limit, page)
+    if result is None:
+        return []
+    return format_listed_messages(result, include_context, context_before, context_after)
+
+
 def get_message_context(
     message_id: str,
     before: int = 5,